@@ -5,6 +5,7 @@ __all__ = [
     "dependencies",
     "models",
     "routers",
+    "scripts",
     "schemas",
     "utils",
 ]
@@ -1,20 +1,82 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import os
+from contextlib import AsyncExitStack
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./students.db"
+from sqlalchemy import event, make_url, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Sync driver names map to their asyncio counterparts, so plain URLs such as
+# postgresql://... keep working with the async engine.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def _async_database_url(url: str) -> str:
+    parsed_url = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed_url.drivername, parsed_url.drivername)
+    return parsed_url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+SQLALCHEMY_DATABASE_URL = _async_database_url(os.getenv("DATABASE_URL", "sqlite:///./students.db"))
+
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    # aiosqlite defaults to NullPool; keep connections open so the pragmas
+    # and SQLite's page cache survive between requests.
+    engine_options = {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_recycle": 1800,
+    }
+else:
+    engine_options = {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": 3600,
+        "pool_pre_ping": True,
+    }
+
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL, **engine_options)
+
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
+
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def create_tables() -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+
+async def warm_up_pool() -> None:
+    pool_size = getattr(engine.pool, "size", None)
+    if pool_size is None:
+        return
+
+    async with AsyncExitStack() as stack:
+        for _ in range(pool_size()):
+            connection = await stack.enter_async_context(engine.connect())
+            await connection.execute(text("SELECT 1"))
+
+
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
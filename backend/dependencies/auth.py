@@ -1,17 +1,18 @@
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db import get_db
-from backend.models.student import Student
+from backend.models.student import Student, select_student_by_email
 from backend.utils.token import decode_access_token, oauth2_scheme
 
 
-def get_current_student(
+async def get_current_student(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Student:
     email = decode_access_token(token)
-    student = db.query(Student).filter(Student.email == email).first()
+    result = await db.execute(select_student_by_email, {"email": email})
+    student = result.scalars().first()
     if student is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
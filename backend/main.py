@@ -1,27 +1,43 @@
+import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 try:
-    from backend.db import Base, engine
+    from backend.db import create_tables, engine, warm_up_pool
     from backend.routers import auth, profile
 except ModuleNotFoundError as exc:
     if exc.name.startswith("backend"):
         sys.path.append(str(Path(__file__).resolve().parent.parent))
-        from backend.db import Base, engine
+        from backend.db import create_tables, engine, warm_up_pool
         from backend.routers import auth, profile
     else:
         raise
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Orus School API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if os.getenv("ORUS_DB_INIT") == "1":
+        await create_tables()
+    await warm_up_pool()
+    yield
+    await engine.dispose()
+
+
+CORS_ORIGINS = tuple(
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")
+    if origin.strip()
+)
+
+app = FastAPI(title="Orus School API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=list(CORS_ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, bindparam, select
 
 from backend.db import Base
 
@@ -11,3 +11,7 @@ class Student(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     avatar_url = Column(String, nullable=True)
+
+
+# Built once and reused with an ``email`` parameter by the auth lookups.
+select_student_by_email = select(Student).where(Student.email == bindparam("email"))
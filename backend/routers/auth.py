@@ -1,48 +1,79 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.db import get_db
-from backend.models.student import Student
+from backend.db import engine, get_db
+from backend.models.student import Student, select_student_by_email
 from backend.schemas.student import StudentCreate, StudentRead, TokenResponse
-from backend.utils.hashing import hash_password, verify_password
+from backend.utils.hashing import (
+    hash_password,
+    needs_rehash,
+    run_in_hashing_executor,
+    verify_password_or_dummy,
+)
 from backend.utils.token import create_access_token
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# Registration relies on INSERT ... ON CONFLICT, which only these dialects provide.
+_DIALECT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+try:
+    _dialect_insert = _DIALECT_INSERTS[engine.dialect.name]
+except KeyError:
+    raise RuntimeError(
+        f"Unsupported database dialect {engine.dialect.name!r}; use SQLite or PostgreSQL"
+    ) from None
+
 
 @router.post("/register", response_model=StudentRead, status_code=status.HTTP_201_CREATED)
-def register_student(student_in: StudentCreate, db: Session = Depends(get_db)) -> Student:
-    existing_student = db.query(Student).filter(Student.email == student_in.email).first()
-    if existing_student:
+async def register_student(student_in: StudentCreate, db: AsyncSession = Depends(get_db)) -> Student:
+    hashed_password = await run_in_hashing_executor(hash_password, student_in.password)
+    statement = (
+        _dialect_insert(Student)
+        .values(
+            full_name=student_in.full_name,
+            email=student_in.email,
+            hashed_password=hashed_password,
+            avatar_url=student_in.avatar_url,
+        )
+        .on_conflict_do_nothing(index_elements=[Student.email])
+        .returning(Student)
+    )
+    result = await db.execute(statement)
+    student = result.scalars().first()
+    if student is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
-    student = Student(
-        full_name=student_in.full_name,
-        email=student_in.email,
-        hashed_password=hash_password(student_in.password),
-        avatar_url=student_in.avatar_url,
-    )
-    db.add(student)
-    db.commit()
-    db.refresh(student)
+    await db.commit()
     return student
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     request: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> TokenResponse:
-    student = db.query(Student).filter(Student.email == request.username).first()
-    if student is None or not verify_password(request.password, student.hashed_password):
+    result = await db.execute(select_student_by_email, {"email": request.username})
+    student = result.scalars().first()
+    stored_hash = student.hashed_password if student is not None else None
+    password_valid = await run_in_hashing_executor(
+        verify_password_or_dummy, request.password, stored_hash
+    )
+    if student is None or not password_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
 
+    if needs_rehash(student.hashed_password):
+        student.hashed_password = await run_in_hashing_executor(hash_password, request.password)
+        await db.commit()
+
     access_token = create_access_token(data={"sub": student.email})
     return TokenResponse(access_token=access_token, token_type="bearer")
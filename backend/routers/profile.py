@@ -8,5 +8,5 @@ router = APIRouter(prefix="/profile", tags=["profile"])
 
 
 @router.get("/me", response_model=StudentRead)
-def read_own_profile(current_student: Student = Depends(get_current_student)) -> Student:
+async def read_own_profile(current_student: Student = Depends(get_current_student)) -> Student:
     return current_student
@@ -0,0 +1,25 @@
+"""Create the Orus School database schema once, outside of the API workers."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+try:
+    from backend.db import create_tables, engine
+    from backend.models import student  # noqa: F401 - registers the tables
+except ModuleNotFoundError as exc:
+    if exc.name.startswith("backend"):
+        sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+        from backend.db import create_tables, engine
+        from backend.models import student  # noqa: F401 - registers the tables
+    else:
+        raise
+
+
+async def main() -> None:
+    await create_tables()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
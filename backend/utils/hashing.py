@@ -1,14 +1,103 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar
+
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+BCRYPT_HASH_PREFIXES = ("$2a$", "$2b$", "$2y$")
+VERIFIED_LOGIN_TTL_SECONDS = 30
+VERIFIED_LOGIN_CACHE_MAX_SIZE = 4096
+
+# Successful checks keyed by an HMAC of (stored hash, attempted password) under a
+# per-process key, so no password-derived material is kept in the clear.
+_verified_logins: Dict[str, float] = {}
+_verified_logins_lock = threading.Lock()
+_VERIFIED_LOGIN_KEY = secrets.token_bytes(32)
+
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=1)
+
+# Hashes of a random password in both schemes. A failed login is checked against
+# whichever of these the stored hash does not cover, so every failure pays for one
+# argon2id and one bcrypt check whether the account exists, has migrated, or still
+# holds a legacy bcrypt hash. The bcrypt dummy can go once no legacy hashes remain.
+_DUMMY_ARGON2_HASH = _password_hasher.hash(secrets.token_urlsafe(16))
+_DUMMY_BCRYPT_HASH = bcrypt.hashpw(secrets.token_bytes(16), bcrypt.gensalt()).decode("utf-8")
+
+# Dedicated to password hashing so login bursts cannot exhaust the shared
+# threadpool that serves the rest of the API.
+hashing_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="password-hashing",
+)
+
+T = TypeVar("T")
+
+
+async def run_in_hashing_executor(func: Callable[..., T], *args: object) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hashing_executor, func, *args)
 
 
 def hash_password(password: str) -> str:
-    password_bytes = password.encode("utf-8")
-    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
-    return hashed.decode("utf-8")
+    return _password_hasher.hash(password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    if hashed_password.startswith(BCRYPT_HASH_PREFIXES):
+        return True
+    return _password_hasher.check_needs_rehash(hashed_password)
+
+
+def _verified_login_key(plain_password: str, hashed_password: str) -> str:
+    message = f"{hashed_password}:{plain_password}".encode("utf-8")
+    return hmac.new(_VERIFIED_LOGIN_KEY, message, hashlib.sha256).hexdigest()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    try:
-        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
-    except ValueError:
+    cache_key = _verified_login_key(plain_password, hashed_password)
+    expires_at = _verified_logins.get(cache_key)
+    if expires_at is not None and expires_at > time.monotonic():
+        return True
+
+    if hashed_password.startswith(BCRYPT_HASH_PREFIXES):
+        try:
+            verified = bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+        except ValueError:
+            return False
+    else:
+        try:
+            verified = _password_hasher.verify(hashed_password, plain_password)
+        except (InvalidHashError, VerificationError):
+            return False
+
+    if verified:
+        with _verified_logins_lock:
+            _verified_logins.pop(cache_key, None)
+            if len(_verified_logins) >= VERIFIED_LOGIN_CACHE_MAX_SIZE:
+                del _verified_logins[next(iter(_verified_logins))]
+            _verified_logins[cache_key] = time.monotonic() + VERIFIED_LOGIN_TTL_SECONDS
+    return verified
+
+
+def verify_password_or_dummy(plain_password: str, hashed_password: Optional[str]) -> bool:
+    if hashed_password is None:
+        verify_password(plain_password, _DUMMY_ARGON2_HASH)
+        verify_password(plain_password, _DUMMY_BCRYPT_HASH)
         return False
+
+    if verify_password(plain_password, hashed_password):
+        return True
+
+    if hashed_password.startswith(BCRYPT_HASH_PREFIXES):
+        verify_password(plain_password, _DUMMY_ARGON2_HASH)
+    else:
+        verify_password(plain_password, _DUMMY_BCRYPT_HASH)
+    return False
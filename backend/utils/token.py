@@ -1,36 +1,59 @@
 import os
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
+import jwt
 from fastapi import HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jwt import InvalidTokenError
 
 SECRET_KEY = os.getenv("SECRET_KEY", "super-secret-key-change-me")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+TOKEN_CACHE_MAX_SIZE = 4096
+
+# Encoded once instead of on every sign/verify call.
+_SIGNING_KEY = SECRET_KEY.encode("utf-8")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Verified tokens mapped to (expiry timestamp, subject), evicted in insertion order.
+_token_cache: Dict[str, Tuple[float, str]] = {}
+_token_cache_lock = threading.Lock()
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> str:
+    cached = _token_cache.get(token)
+    if cached is not None and cached[0] > time.time():
+        return cached[1]
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, _SIGNING_KEY, algorithms=[ALGORITHM])
         subject: Optional[str] = payload.get("sub")
         if subject is None:
-            raise JWTError("Missing subject claim")
-        return subject
-    except JWTError as exc:  # pragma: no cover - defensive branch
+            raise InvalidTokenError("Missing subject claim")
+    except InvalidTokenError as exc:  # pragma: no cover - defensive branch
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         ) from exc
+
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        with _token_cache_lock:
+            _token_cache.pop(token, None)
+            if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+                del _token_cache[next(iter(_token_cache))]
+            _token_cache[token] = (float(expires_at), subject)
+    return subject